@@ -0,0 +1,293 @@
+# automation/analyze_clock_images.py
+#
+# Local (CPU-only, no network) analysis of the images produced by the CLOCK benchmark.
+# For every image in CLOCK_IMAGES_DIR it finds the clock face (circle Hough transform on the image gradients),
+# the hands (radial line search from the face center), and compares the displayed time with the time requested
+# in the matching CLOCK prompt.
+#
+# Usage (from the automation directory):
+#     python analyze_clock_images.py                 # analyze every image in RESULTS/CLOCK_IMAGES
+#     python analyze_clock_images.py img1.png ...    # analyze specific images or directories
+
+import os
+import re
+import sys
+import json
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from PIL import Image
+
+# --- ANALYSIS SETTINGS ---
+ANALYSIS_IMAGE_SIZE = 256 # Images are decoded downsampled so that they fit in this many pixels
+ANALYSIS_BATCH_SIZE = 8 # Images per worker task
+ANALYSIS_WORKERS = None # Process pool size; None uses os.cpu_count()
+
+CIRCLE_MIN_RADIUS_FRACTION = 0.15 # Of the shorter image side
+CIRCLE_MAX_RADIUS_FRACTION = 0.5
+CIRCLE_RADIUS_STEP = 2 # Pixels, in the downsampled image
+CIRCLE_MIN_SCORE = 0.5 # Edge votes per pixel of circumference needed to accept a clock face
+EDGE_MIN_MAGNITUDE = 0.5 # Minimum Sobel magnitude (on 0-1 grayscale) for a pixel to count as an edge
+MAX_EDGE_POINTS = 6000
+
+HAND_ANGLE_STEP_DEGREES = 1
+HAND_RAY_SAMPLES = 64
+HAND_INK_THRESHOLD = 0.25 # Minimum difference from the face brightness for a pixel to count as "ink"
+HAND_MAX_GAP_SAMPLES = 2 # A hand may have gaps (e.g. the center hub) of at most this many samples
+HAND_MIN_LENGTH_FRACTION = 0.3 # Of the face radius
+HAND_MIN_SEPARATION_DEGREES = 12
+
+TIME_MATCH_TOLERANCE_MINUTES = 5 # Displayed time within this many minutes of the requested time counts as a MATCH
+
+# --- FILE & DIRECTORY PATHS ---
+ROOT_DIR = os.path.join(os.path.dirname(__file__), '..')
+CLOCK_PROMPTS_PATH = os.path.join(ROOT_DIR, 'CLOCK', 'prompts.md')
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'RESULTS')
+CLOCK_IMAGES_DIR = os.path.join(RESULTS_DIR, 'CLOCK_IMAGES')
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')
+
+# --- PROMPT HANDLING ---
+def parse_clock_prompts(file_path=CLOCK_PROMPTS_PATH):
+    """Returns the numbered prompts of CLOCK/prompts.md (same rule as parse_md_file in run_benchmark.py)."""
+    if not os.path.exists(file_path):
+        return []
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and line.strip()[0].isdigit()]
+
+def parse_requested_time(prompt_text):
+    """Extracts the time requested in a prompt as (hour 1-12, minute), or None if the prompt names no time."""
+    if not prompt_text:
+        return None
+    text = re.sub(r'^\s*\d+\.\s*', '', prompt_text).lower() # Drop the "1. " prompt numbering
+    match = re.search(r'\b(\d{1,2})[:h](\d{2})(?!\d)', text)
+    if match:
+        hour, minute = int(match.group(1)), int(match.group(2))
+    else:
+        match = re.search(r"\b(\d{1,2})\s*(?:o'?\s?clock|am|pm|a\.m\.|p\.m\.)", text)
+        if not match:
+            return None
+        hour, minute = int(match.group(1)), 0
+    if hour > 23 or minute > 59:
+        return None
+    return (hour % 12 or 12, minute)
+
+def prompt_for_image(image_path, prompts):
+    """Maps an image to its prompt using the NNN_ index prefix written by run_relogio_benchmark."""
+    match = re.match(r'(\d{3})_', os.path.basename(image_path))
+    if not match:
+        return None
+    index = int(match.group(1)) - 1
+    return prompts[index] if 0 <= index < len(prompts) else None
+
+# --- IMAGE GEOMETRY ---
+def load_image_downsampled(image_path, size=ANALYSIS_IMAGE_SIZE):
+    """Decodes an image as grayscale at reduced resolution. Returns a float32 array in [0, 1]."""
+    with Image.open(image_path) as img:
+        img.draft("L", (size, size)) # JPEG: decode directly at a reduced DCT scale
+        img = img.convert("L")
+        img.thumbnail((size, size), Image.BILINEAR)
+        return np.asarray(img, dtype=np.float32) / 255.0
+
+def _sobel(gray):
+    p = np.pad(gray, 1, mode="edge")
+    gx = (p[:-2, 2:] + 2 * p[1:-1, 2:] + p[2:, 2:]) - (p[:-2, :-2] + 2 * p[1:-1, :-2] + p[2:, :-2])
+    gy = (p[2:, :-2] + 2 * p[2:, 1:-1] + p[2:, 2:]) - (p[:-2, :-2] + 2 * p[:-2, 1:-1] + p[:-2, 2:])
+    return gx, gy
+
+def detect_clock_face(gray):
+    """Finds the most prominent circle with a gradient-directed Hough transform.
+
+    Every edge pixel votes for the centers lying at each candidate radius along (and against) its gradient.
+    Returns {"center": (x, y), "radius": r, "score": s} in downsampled pixels, or None if no circle is found.
+    """
+    height, width = gray.shape
+    gx, gy = _sobel(gray)
+    magnitude = np.hypot(gx, gy)
+    ys, xs = np.nonzero(magnitude >= EDGE_MIN_MAGNITUDE)
+    if len(xs) == 0:
+        return None
+    if len(xs) > MAX_EDGE_POINTS:
+        keep = np.random.default_rng(0).choice(len(xs), MAX_EDGE_POINTS, replace=False)
+        ys, xs = ys[keep], xs[keep]
+    ux = gx[ys, xs] / magnitude[ys, xs]
+    uy = gy[ys, xs] / magnitude[ys, xs]
+
+    shorter_side = min(height, width)
+    radii = np.arange(max(int(CIRCLE_MIN_RADIUS_FRACTION * shorter_side), 4),
+                      int(CIRCLE_MAX_RADIUS_FRACTION * shorter_side) + 1, CIRCLE_RADIUS_STEP)
+    if len(radii) == 0:
+        return None
+    accumulator = np.zeros((len(radii), height, width), dtype=np.float32)
+    for sign in (1, -1):
+        cx = np.rint(xs[None, :] + sign * radii[:, None] * ux[None, :]).astype(np.int64)
+        cy = np.rint(ys[None, :] + sign * radii[:, None] * uy[None, :]).astype(np.int64)
+        radius_index = np.broadcast_to(np.arange(len(radii))[:, None], cx.shape)
+        inside = (cx >= 0) & (cx < width) & (cy >= 0) & (cy < height)
+        np.add.at(accumulator, (radius_index[inside], cy[inside], cx[inside]), 1.0)
+
+    # Tolerate quantization: sum the votes of each 3x3 center neighbourhood
+    padded = np.pad(accumulator, ((0, 0), (1, 1), (1, 1)))
+    smoothed = sum(padded[:, dy:dy + height, dx:dx + width] for dy in range(3) for dx in range(3))
+    scores = smoothed / (2 * np.pi * radii[:, None, None])
+    radius_index, center_y, center_x = np.unravel_index(np.argmax(scores), scores.shape)
+    score = float(scores[radius_index, center_y, center_x])
+    if score < CIRCLE_MIN_SCORE:
+        return None
+    return {"center": (int(center_x), int(center_y)), "radius": int(radii[radius_index]), "score": round(score, 3)}
+
+def detect_clock_hands(gray, face):
+    """Searches rays from the face center for hands: strokes of "ink" that start at the center.
+
+    Returns a list of up to two (angle_degrees, length_fraction) tuples sorted by length, longest first.
+    Angles are measured clockwise from 12 o'clock.
+    """
+    height, width = gray.shape
+    center_x, center_y = face["center"]
+    radius = face["radius"]
+
+    angles = np.arange(0, 360, HAND_ANGLE_STEP_DEGREES)
+    distances = np.linspace(0.08, 0.95, HAND_RAY_SAMPLES)
+    theta = np.deg2rad(angles)[:, None]
+    sample_x = np.clip(np.rint(center_x + np.sin(theta) * distances[None, :] * radius), 0, width - 1).astype(np.int64)
+    sample_y = np.clip(np.rint(center_y - np.cos(theta) * distances[None, :] * radius), 0, height - 1).astype(np.int64)
+    samples = gray[sample_y, sample_x]
+
+    face_brightness = np.median(samples[:, HAND_RAY_SAMPLES // 3:])
+    ink = np.abs(samples - face_brightness) >= HAND_INK_THRESHOLD
+
+    # Length of the stroke from the center along each ray, allowing short gaps
+    gap = np.zeros(len(angles), dtype=np.int64)
+    alive = np.ones(len(angles), dtype=bool)
+    length = np.zeros(len(angles))
+    for j, distance in enumerate(distances):
+        gap = np.where(ink[:, j], 0, gap + 1)
+        alive &= gap <= HAND_MAX_GAP_SAMPLES
+        length = np.where(alive & ink[:, j], distance, length)
+
+    # Angular peaks: longest rays first, suppressing neighbours of an accepted peak (hands are several rays wide)
+    hands = []
+    for index in np.argsort(-length, kind="stable"):
+        if length[index] < HAND_MIN_LENGTH_FRACTION or len(hands) == 2:
+            break
+        angle = float(angles[index])
+        if all(min(abs(angle - a), 360 - abs(angle - a)) >= HAND_MIN_SEPARATION_DEGREES for a, _ in hands):
+            hands.append((angle, float(length[index])))
+    return hands
+
+def hands_to_time(hands):
+    """Converts detected hands to a displayed (hour 1-12, minute). The longer hand is the minute hand."""
+    if not hands:
+        return None
+    minute_angle = hands[0][0]
+    hour_angle = hands[1][0] if len(hands) > 1 else minute_angle # Overlapping hands
+    minute = int(round(minute_angle / 6)) % 60
+    # Use the minute hand to resolve where the hour hand sits between two hour marks
+    hour = int(round((hour_angle - minute * 0.5) / 30)) % 12
+    return (hour or 12, minute)
+
+def time_difference_minutes(time_a, time_b):
+    """Smallest difference in minutes between two (hour, minute) times on a 12-hour dial."""
+    minutes_a = (time_a[0] % 12) * 60 + time_a[1]
+    minutes_b = (time_b[0] % 12) * 60 + time_b[1]
+    difference = abs(minutes_a - minutes_b) % 720
+    return min(difference, 720 - difference)
+
+def format_time(clock_time):
+    return f"{clock_time[0]}:{clock_time[1]:02d}" if clock_time else None
+
+# --- ANALYSIS ---
+def analyze_clock_image(image_path, prompt_text=None):
+    result = {
+        "image_path": image_path,
+        "prompt": prompt_text,
+        "requested_time": format_time(parse_requested_time(prompt_text)),
+        "clock_face": None,
+        "hands": [],
+        "displayed_time": None,
+        "time_error_minutes": None,
+        "status": "Error"
+    }
+    try:
+        gray = load_image_downsampled(image_path)
+    except Exception as e:
+        result["status"] = f"ERROR: Could not load image - {type(e).__name__} - {str(e)}"
+        return result
+
+    try:
+        face = detect_clock_face(gray)
+        if not face:
+            result["status"] = "NO_CLOCK_FACE_DETECTED"
+            return result
+        result["clock_face"] = face
+
+        hands = detect_clock_hands(gray, face)
+        result["hands"] = [{"angle_degrees": angle, "length_fraction": round(length, 3)} for angle, length in hands]
+        displayed_time = hands_to_time(hands)
+    except Exception as e:
+        result["status"] = f"ERROR: Could not analyze image - {type(e).__name__} - {str(e)}"
+        return result
+    if not displayed_time:
+        result["status"] = "NO_HANDS_DETECTED"
+        return result
+    result["displayed_time"] = format_time(displayed_time)
+
+    requested_time = parse_requested_time(prompt_text)
+    if not requested_time:
+        result["status"] = "NO_TIME_REQUESTED"
+        return result
+    error = time_difference_minutes(displayed_time, requested_time)
+    result["time_error_minutes"] = error
+    result["status"] = "MATCH" if error <= TIME_MATCH_TOLERANCE_MINUTES else "MISMATCH"
+    return result
+
+def analyze_batch(batch):
+    """Worker task: analyzes a list of (image_path, prompt_text) pairs."""
+    return [analyze_clock_image(image_path, prompt_text) for image_path, prompt_text in batch]
+
+def collect_image_paths(paths):
+    image_paths = []
+    for path in paths:
+        if os.path.isdir(path):
+            image_paths.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                               if name.lower().endswith(IMAGE_EXTENSIONS))
+        elif os.path.isfile(path):
+            image_paths.append(path)
+        else:
+            print(f"WARNING: {path} does not exist. Skipping.")
+    return image_paths
+
+def analyze_clock_images(image_paths, prompts=None):
+    """Analyzes images in parallel across a process pool. Returns one result dict per image, in input order.
+
+    `prompts` is the CLOCK prompt list used to look up the requested time (defaults to CLOCK/prompts.md).
+    """
+    if prompts is None:
+        prompts = parse_clock_prompts()
+    work = [(path, prompt_for_image(path, prompts)) for path in image_paths]
+    batches = [work[i:i + ANALYSIS_BATCH_SIZE] for i in range(0, len(work), ANALYSIS_BATCH_SIZE)]
+    if len(batches) <= 1:
+        return analyze_batch(work)
+    with ProcessPoolExecutor(max_workers=ANALYSIS_WORKERS) as executor:
+        return [result for batch_results in executor.map(analyze_batch, batches) for result in batch_results]
+
+if __name__ == "__main__":
+    image_paths = collect_image_paths(sys.argv[1:] or [CLOCK_IMAGES_DIR])
+    print(f"Analyzing {len(image_paths)} CLOCK image(s)...")
+    start_time = datetime.now()
+    analysis_results = analyze_clock_images(image_paths)
+    elapsed = (datetime.now() - start_time).total_seconds()
+
+    for result in analysis_results:
+        print(f"  {os.path.basename(result['image_path'])}: {result['status']} "
+              f"(requested: {result['requested_time']}, displayed: {result['displayed_time']})")
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    results_filename = os.path.join(RESULTS_DIR, f"clock_analysis_{timestamp}.json")
+    try:
+        with open(results_filename, 'w', encoding='utf-8') as f:
+            json.dump({"analysis_date": datetime.now().isoformat(), "results": analysis_results}, f, indent=4, ensure_ascii=False)
+        print(f"\n✅ CLOCK analysis complete in {elapsed:.1f}s. Results saved to:\n{results_filename}")
+    except Exception as e:
+        print(f"ERROR: Could not save results to JSON file: {e}")
+        print(json.dumps(analysis_results, indent=4, ensure_ascii=False))
@@ -5,9 +5,16 @@ from google.api_core import exceptions as google_exceptions
 import openai # Import OpenAI library
 import os
 import json
+import copy
 from datetime import datetime
 from PIL import Image
 import time
+import math
+import threading
+import urllib.request
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from analyze_clock_images import analyze_clock_images
 
 # --- CONFIGURATION ---
 try:
@@ -30,6 +37,34 @@ if GEMINI_API_KEY and GEMINI_API_KEY != "YOUR_GEMINI_API_KEY_HERE":
 # --- DEFAULT SETTINGS ---
 DEFAULT_IMAGE_GENERATION_SIZE = "1024x1024" # Default size for DALL-E, etc.
 
+# Preflight: validate credentials and model availability for every model (concurrently) before any benchmark runs.
+RUN_PREFLIGHT_CHECKS = True
+
+# Circuit breaker: after this many consecutive identical non-quota errors from a model, its remaining prompts are
+# short-circuited without calling the API or sleeping. The provider-wide circuit only opens when the same error comes
+# from at least two different models, so a model-specific error (e.g. "model not found") does not block the next model.
+CIRCUIT_BREAKER_THRESHOLD = 3
+# Once open, a single "half-open" probe call is let through after every this many short-circuited prompts.
+# This is a count rather than a cooldown in seconds: short-circuited prompts take no time, so a time-based cooldown
+# would never expire during a run. Success closes the circuit, failure re-opens it and restarts the count.
+CIRCUIT_BREAKER_PROBE_INTERVAL = 5
+
+# Analyze generated CLOCK images locally (clock face, hands, displayed vs. requested time) after the run.
+RUN_CLOCK_IMAGE_ANALYSIS = True
+
+# Deadlines: every API call is bounded by these timeouts (passed to the SDK and enforced by the runner).
+API_CALL_TIMEOUT_SECONDS = 120
+IMAGE_GENERATION_TIMEOUT_SECONDS = 180
+
+# Hedged requests: when a text/vision call takes longer than HEDGE_LATENCY_PERCENTILE of the recent latencies of
+# the same model, a duplicate request is sent and whichever answer arrives first wins. Hedges are capped at
+# HEDGE_MAX_FRACTION of all calls. Image generation calls are never hedged.
+ENABLE_HEDGED_REQUESTS = False
+HEDGE_LATENCY_PERCENTILE = 95
+HEDGE_LATENCY_WINDOW = 50 # Number of recent latencies kept per model
+HEDGE_MIN_LATENCY_SAMPLES = 5 # No hedging until this many latencies have been recorded for the model
+HEDGE_MAX_FRACTION = 0.1
+
 # --- FILE & DIRECTORY PATHS ---
 ROOT_DIR = os.path.join(os.path.dirname(__file__), '..')
 ENIGMA_PROMPTS_PATH = os.path.join(ROOT_DIR, 'ENIGMA', 'prompts.md')
@@ -78,6 +113,228 @@ api_calls_successful = 0
 api_calls_failed_quota = 0
 api_calls_failed_other = 0
 api_calls_pending_implementation = 0 # New counter
+api_calls_short_circuited = 0 # Prompts skipped because a circuit breaker was open
+api_calls_hedged = 0 # Duplicate (hedge) requests sent
+api_calls_timed_out = 0 # Calls that hit their deadline
+
+# --- CIRCUIT BREAKERS ---
+# Keyed by "provider:<name>" and "model:<name>". Each entry tracks the last error, how many times in a row
+# it was seen (and, for provider keys, by which models), and how many prompts were short-circuited since the circuit
+# (re-)opened.
+circuit_breakers = {}
+
+def _circuit_keys(model_info):
+    return [f"provider:{model_info['provider']}", f"model:{model_info['name']}"]
+
+def circuit_allows_call(model_info):
+    """Returns True if a call may be made for this model, False if it should be short-circuited.
+
+    An open circuit lets one probe call through (half-open) after every CIRCUIT_BREAKER_PROBE_INTERVAL skipped prompts.
+    """
+    open_keys = [key for key in _circuit_keys(model_info)
+                 if circuit_breakers.get(key) and circuit_breakers[key]["state"] == "open"]
+    if any(circuit_breakers[key]["skipped_since_open"] < CIRCUIT_BREAKER_PROBE_INTERVAL for key in open_keys):
+        for key in open_keys:
+            circuit_breakers[key]["skipped_since_open"] += 1
+        return False
+    for key in open_keys:
+        print(f"INFO: Circuit breaker for {key} is half-open. Sending a probe call.")
+        circuit_breakers[key]["state"] = "half_open"
+    return True
+
+def record_circuit_success(model_info):
+    for key in _circuit_keys(model_info):
+        breaker = circuit_breakers.get(key)
+        if breaker and breaker["state"] != "closed":
+            print(f"INFO: Circuit breaker for {key} closed after a successful call.")
+        circuit_breakers[key] = {"state": "closed", "last_error": None, "consecutive_errors": 0, "skipped_since_open": 0, "models": set()}
+
+def record_circuit_failure(model_info, error_message):
+    """Records a non-quota error. Returns True if this failure opened (or re-opened) a circuit."""
+    tripped = False
+    for key in _circuit_keys(model_info):
+        breaker = circuit_breakers.setdefault(key, {"state": "closed", "last_error": None, "consecutive_errors": 0, "skipped_since_open": 0, "models": set()})
+        if breaker["last_error"] == error_message:
+            breaker["consecutive_errors"] += 1
+        else:
+            breaker["last_error"] = error_message
+            breaker["consecutive_errors"] = 1
+            breaker["models"] = set()
+        breaker["models"].add(model_info['name'])
+        min_models = 2 if key.startswith("provider:") else 1
+        threshold_reached = breaker["consecutive_errors"] >= CIRCUIT_BREAKER_THRESHOLD and len(breaker["models"]) >= min_models
+        if breaker["state"] == "half_open" or (breaker["state"] == "closed" and threshold_reached):
+            print(f"INFO: Circuit breaker for {key} OPEN after {breaker['consecutive_errors']} consecutive identical errors: {error_message[:100]}")
+            breaker["state"] = "open"
+            breaker["skipped_since_open"] = 0
+            tripped = True
+    return tripped
+
+def short_circuit_message(model_info):
+    for key in _circuit_keys(model_info):
+        breaker = circuit_breakers.get(key)
+        if breaker and breaker["state"] != "closed":
+            return f"SKIPPED_DUE_TO_CIRCUIT_BREAKER - {key}: {breaker['last_error']}"
+    return "SKIPPED_DUE_TO_CIRCUIT_BREAKER"
+
+# --- DEADLINES & HEDGED REQUESTS ---
+api_call_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="api_call")
+model_latencies = {} # model name -> deque of recent successful call latencies (seconds)
+model_latencies_lock = threading.Lock() # Attempts append from worker threads, including losing hedges
+hedge_audit_log = [] # One entry per hedged or timed-out call, written to the results file
+unfinished_attempts = [] # Futures of attempts still running when their call returned (e.g. losing hedges)
+calls_with_deadline = 0
+
+def _hedge_threshold(model_name):
+    """Returns the latency (seconds) after which a hedge should be sent, or None if hedging is not allowed."""
+    with model_latencies_lock:
+        ordered = sorted(model_latencies.get(model_name, ()))
+    if not ENABLE_HEDGED_REQUESTS or len(ordered) < HEDGE_MIN_LATENCY_SAMPLES:
+        return None
+    if api_calls_hedged + 1 > HEDGE_MAX_FRACTION * calls_with_deadline:
+        return None
+    index = min(len(ordered) - 1, max(0, math.ceil(HEDGE_LATENCY_PERCENTILE / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def call_with_deadline(model_info, request_fn, timeout=API_CALL_TIMEOUT_SECONDS, allow_hedge=True):
+    """Calls request_fn(timeout) and returns its response, bounded by `timeout` seconds.
+
+    If hedging is enabled and the call is slower than the model's recent latency percentile, a duplicate call is
+    made and the first successful response wins. Raises the call's exception if all attempts fail, or TimeoutError.
+    """
+    global calls_with_deadline, api_calls_hedged, api_calls_timed_out, api_calls_total
+    model_name = model_info['name']
+    calls_with_deadline += 1
+    start = time.monotonic()
+    deadline = start + timeout
+    hedge_after = _hedge_threshold(model_name) if allow_hedge else None
+    audit = {"model": model_name, "hedge_after_seconds": hedge_after, "winner": None, "attempts": {}}
+
+    def submit_attempt(label):
+        # All keys exist up front so that a snapshot taken while the attempt is still running never sees the dict change size
+        outcome = {"status": "pending", "started_after_seconds": round(time.monotonic() - start, 3), "latency_seconds": None}
+        audit["attempts"][label] = outcome
+        return api_call_executor.submit(attempt, outcome)
+
+    def attempt(outcome):
+        attempt_start = time.monotonic()
+        try:
+            response = request_fn(max(deadline - attempt_start, 1))
+            latency = time.monotonic() - attempt_start
+            with model_latencies_lock:
+                model_latencies.setdefault(model_name, deque(maxlen=HEDGE_LATENCY_WINDOW)).append(latency)
+            outcome["status"] = "ok"
+            return response
+        except Exception as e:
+            outcome["status"] = f"error: {type(e).__name__} - {str(e)[:200]}"
+            raise
+        finally:
+            outcome["latency_seconds"] = round(time.monotonic() - attempt_start, 3)
+
+    def cancel_outstanding(outstanding):
+        """Cancels attempts still waiting for a worker; attempts already running are left to finish in the background."""
+        for future in outstanding:
+            if future.cancel():
+                audit["attempts"][futures[future]]["status"] = "cancelled (never started)"
+            else:
+                unfinished_attempts.append(future)
+
+    futures = {submit_attempt("primary"): "primary"}
+    outstanding = set(futures)
+    hedge_sent = False
+    first_error = None
+    while outstanding:
+        wake_at = deadline
+        if hedge_after is not None and not hedge_sent:
+            wake_at = min(wake_at, start + hedge_after)
+        done, outstanding = wait(outstanding, timeout=max(wake_at - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                audit["winner"] = futures[future]
+                cancel_outstanding(outstanding)
+                return future.result()
+            if first_error is None:
+                first_error = future.exception()
+        if not done:
+            if hedge_after is not None and not hedge_sent and time.monotonic() < deadline:
+                print(f"INFO: {model_name} call exceeded p{HEDGE_LATENCY_PERCENTILE} latency ({hedge_after:.1f}s). Sending hedged request.")
+                hedge_sent = True
+                api_calls_hedged += 1
+                api_calls_total += 1 # The hedge is a real (billed) call
+                hedge_audit_log.append(audit)
+                hedge_future = submit_attempt("hedge")
+                futures[hedge_future] = "hedge"
+                outstanding.add(hedge_future)
+                continue
+            break
+
+    if first_error is not None and not outstanding:
+        raise first_error
+    cancel_outstanding(outstanding)
+    api_calls_timed_out += 1
+    audit["winner"] = "timeout"
+    if not hedge_sent:
+        hedge_audit_log.append(audit)
+    raise TimeoutError(f"No response from {model_name} within {timeout}s deadline")
+
+def drain_unfinished_attempts():
+    """Waits (up to API_CALL_TIMEOUT_SECONDS) for attempts that outlived their call, so that the outcome of losing
+    hedges is in hedge_audit_log before the results file is written."""
+    pending = [future for future in unfinished_attempts if not future.done()]
+    if pending:
+        print(f"Waiting for {len(pending)} unfinished hedged/timed-out attempt(s) to record their outcome...")
+        wait(pending, timeout=API_CALL_TIMEOUT_SECONDS)
+    unfinished_attempts.clear()
+    # Attempts still hung after the wait must not keep the process alive: queued ones are dropped, and running ones
+    # end at the latest when their SDK timeout expires
+    api_call_executor.shutdown(wait=False, cancel_futures=True)
+
+# --- PREFLIGHT CHECKS ---
+def preflight_check_model(model_info, clients):
+    """Validates credentials and model availability with a cheap metadata call. Returns (ok, detail)."""
+    model_name = model_info['name']
+    provider = model_info['provider']
+    try:
+        if provider == "google":
+            model = genai.get_model(model_name if model_name.startswith("models/") else f"models/{model_name}",
+                                    request_options={"timeout": API_CALL_TIMEOUT_SECONDS})
+            return True, f"OK - {model.name}"
+        elif provider == "openai":
+            client = clients.get("openai")
+            if not client:
+                return False, "OpenAI client not initialized"
+            model = client.models.retrieve(model_name, timeout=API_CALL_TIMEOUT_SECONDS)
+            return True, f"OK - {model.id}"
+        elif provider == "google_imagen":
+            return True, "PENDING_IMPLEMENTATION - No preflight check for Imagen"
+        else:
+            return False, f"Unknown provider '{provider}'"
+    except google_exceptions.ResourceExhausted as e:
+        # Quota may recover during the run; let the benchmark functions deal with it.
+        return True, f"WARNING - Quota Exceeded (429) during preflight: {e.message}"
+    except google_exceptions.GoogleAPIError as e:
+        return False, f"API Error (Google): {type(e).__name__} - {e.message}"
+    except openai.APIStatusError as e:
+        if e.status_code == 429:
+            return True, f"WARNING - Quota Exceeded (429) during preflight: {e.message}"
+        return False, f"API Error (OpenAI): {type(e).__name__} - {e.status_code} - {e.message}"
+    except openai.APIConnectionError as e:
+        return False, f"API Error (OpenAI): ConnectionError - {e.message}"
+    except Exception as e:
+        return False, f"Non-API Error: {type(e).__name__} - {str(e)}"
+
+def run_preflight_checks(models, clients):
+    """Runs preflight_check_model for all models concurrently. Returns {model_name: {"ok": bool, "detail": str}}."""
+    print(f"\n--- Running preflight checks for {len(models)} model(s) ---")
+    if not models:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(models)) as executor:
+        checks = list(executor.map(lambda m: preflight_check_model(m, clients), models))
+    preflight_results = {}
+    for model_info, (ok, detail) in zip(models, checks):
+        preflight_results[model_info['name']] = {"ok": ok, "detail": detail}
+        print(f"  {'PASS' if ok else 'FAIL'}: {model_info['name']} ({model_info['provider']}) - {detail}")
+    return preflight_results
 
 # --- PARSING FUNCTIONS ---
 def parse_md_file(file_path):
@@ -160,27 +417,33 @@ def run_enigma_benchmark(model_info, client, prompts_list):
 
     if model_type == "image_generation":
         print(f"INFO: {model_name} is an image generation model. Skipping {benchmark_name} text benchmark.")
-        for prompt in prompts:
+        for prompt in prompts_list:
             results[prompt] = "EXCLUDED - Model is for image generation"
         return results
 
-    for i, prompt in enumerate(prompts):
-        print(f"  Processing {benchmark_name} prompt {i+1}/{len(prompts)} for {model_name}: {prompt[:70]}...")
-        global api_calls_total, api_calls_successful, api_calls_failed_quota, api_calls_failed_other
+    for i, prompt in enumerate(prompts_list):
+        print(f"  Processing {benchmark_name} prompt {i+1}/{len(prompts_list)} for {model_name}: {prompt[:70]}...")
+        global api_calls_total, api_calls_successful, api_calls_failed_quota, api_calls_failed_other, api_calls_short_circuited
+        if not circuit_allows_call(model_info):
+            results[prompt] = short_circuit_message(model_info)
+            api_calls_short_circuited += 1
+            continue
         api_calls_total += 1
         quota_error_hit = False
         response_text = None
+        error_message = None
 
         try:
             if provider == "google":
-                response = client.generate_content(prompt)
+                response = call_with_deadline(model_info, lambda timeout, prompt=prompt: client.generate_content(prompt, request_options={"timeout": timeout}))
                 response_text = response.text
             elif provider == "openai":
                 # Assuming client is an OpenAI client instance
-                completion = client.chat.completions.create(
+                completion = call_with_deadline(model_info, lambda timeout, prompt=prompt: client.chat.completions.create(
                     model=model_name,
-                    messages=[{"role": "user", "content": prompt}]
-                )
+                    messages=[{"role": "user", "content": prompt}],
+                    timeout=timeout
+                ))
                 response_text = completion.choices[0].message.content
             else:
                 results[prompt] = f"ERROR: Unknown provider '{provider}' for model {model_name}"
@@ -221,14 +484,20 @@ def run_enigma_benchmark(model_info, client, prompts_list):
             results[prompt] = error_message
             api_calls_failed_other += 1
 
-        if SECONDS_BETWEEN_API_CALLS > 0 and not quota_error_hit:
+        circuit_tripped = False
+        if error_message and not quota_error_hit:
+            circuit_tripped = record_circuit_failure(model_info, error_message)
+        elif response_text:
+            record_circuit_success(model_info)
+
+        if SECONDS_BETWEEN_API_CALLS > 0 and not quota_error_hit and not circuit_tripped:
             time.sleep(SECONDS_BETWEEN_API_CALLS)
 
         if quota_error_hit:
             print(f"INFO: API Quota Exceeded in {benchmark_name} for {model_name}. Skipping remaining prompts for this model in this benchmark.")
             # Fill remaining prompts as "SKIPPED_DUE_TO_QUOTA"
-            for remaining_prompt_idx in range(i + 1, len(prompts)):
-                results[prompts[remaining_prompt_idx]] = "SKIPPED_DUE_TO_QUOTA"
+            for remaining_prompt_idx in range(i + 1, len(prompts_list)):
+                results[prompts_list[remaining_prompt_idx]] = "SKIPPED_DUE_TO_QUOTA"
             break
     return results
 
@@ -250,25 +519,30 @@ def run_visual_benchmark(model_info, client, visual_prompts_data): # Argument ch
     # Multimodal models should have type 'vision'.
     if model_type == "text":
         print(f"INFO: {model_name} is a text-only model. Skipping {benchmark_name} (visual understanding task).")
-        for data in prompts_data:
+        for data in visual_prompts_data:
             prompt_key = f"{data['prompt']} [{os.path.basename(data['image_path'])}]"
             results[prompt_key] = "EXCLUDED - Model is text-only, not suited for visual understanding"
         return results
     elif model_type == "image_generation":
         print(f"INFO: {model_name} is an image generation model. Skipping {benchmark_name} (vision understanding).")
-        for data in prompts_data:
+        for data in visual_prompts_data:
             prompt_key = f"{data['prompt']} [{os.path.basename(data['image_path'])}]"
             results[prompt_key] = "EXCLUDED - Model is for image generation, not vision understanding"
         return results
 
 
-    for i, data in enumerate(prompts_data):
+    for i, data in enumerate(visual_prompts_data):
         prompt_key = f"{data['prompt']} [{os.path.basename(data['image_path'])}]"
-        print(f"  Processing {benchmark_name} prompt {i+1}/{len(prompts_data)} for {model_name} ({os.path.basename(data['image_path'])})..." )
-        global api_calls_total, api_calls_successful, api_calls_failed_quota, api_calls_failed_other
+        print(f"  Processing {benchmark_name} prompt {i+1}/{len(visual_prompts_data)} for {model_name} ({os.path.basename(data['image_path'])})..." )
+        global api_calls_total, api_calls_successful, api_calls_failed_quota, api_calls_failed_other, api_calls_short_circuited
+        if not circuit_allows_call(model_info):
+            results[prompt_key] = short_circuit_message(model_info)
+            api_calls_short_circuited += 1
+            continue
         api_calls_total += 1
         quota_error_hit = False
         response_text = None
+        error_message = None
 
         try:
             img = Image.open(data['image_path'])
@@ -277,7 +551,7 @@ def run_visual_benchmark(model_info, client, visual_prompts_data): # Argument ch
                      results[prompt_key] = "EXCLUDED - Model not configured for vision"
                      api_calls_failed_other +=1 # Or a better counter
                      continue
-                response = client.generate_content([data['prompt'], img])
+                response = call_with_deadline(model_info, lambda timeout, data=data, img=img: client.generate_content([data['prompt'], img], request_options={"timeout": timeout}))
                 response_text = response.text
             # Add OpenAI vision model handling here if/when available and different from text
             # For now, assuming OpenAI vision would be handled by a model type 'vision' and use a similar structure
@@ -341,13 +615,19 @@ def run_visual_benchmark(model_info, client, visual_prompts_data): # Argument ch
             results[prompt_key] = error_message
             api_calls_failed_other += 1
 
-        if SECONDS_BETWEEN_API_CALLS > 0 and not quota_error_hit:
+        circuit_tripped = False
+        if error_message and not quota_error_hit:
+            circuit_tripped = record_circuit_failure(model_info, error_message)
+        elif response_text:
+            record_circuit_success(model_info)
+
+        if SECONDS_BETWEEN_API_CALLS > 0 and not quota_error_hit and not circuit_tripped:
             time.sleep(SECONDS_BETWEEN_API_CALLS)
 
         if quota_error_hit:
             print(f"INFO: API Quota Exceeded in {benchmark_name} for {model_name}. Skipping remaining prompts for this model in this benchmark.")
-            for remaining_idx in range(i + 1, len(prompts_data)):
-                remaining_data = prompts_data[remaining_idx]
+            for remaining_idx in range(i + 1, len(visual_prompts_data)):
+                remaining_data = visual_prompts_data[remaining_idx]
                 prompt_key_skipped = f"{remaining_data['prompt']} [{os.path.basename(remaining_data['image_path'])}]"
                 results[prompt_key_skipped] = "SKIPPED_DUE_TO_QUOTA"
             break
@@ -377,20 +657,26 @@ def run_lipogram_benchmark(model_info, client, prompts_list):
     # For now, assuming 'vision' models like Gemini 1.5 Flash can also handle text.
 
     for i, prompt in enumerate(prompts_list): # Iterate over prompts_list
-        print(f"  Processing {benchmark_name} prompt {i+1}/{len(prompts)} for {model_name}: {prompt[:70]}...")
-        global api_calls_total, api_calls_successful, api_calls_failed_quota, api_calls_failed_other
+        print(f"  Processing {benchmark_name} prompt {i+1}/{len(prompts_list)} for {model_name}: {prompt[:70]}...")
+        global api_calls_total, api_calls_successful, api_calls_failed_quota, api_calls_failed_other, api_calls_short_circuited
+        if not circuit_allows_call(model_info):
+            results[prompt] = short_circuit_message(model_info)
+            api_calls_short_circuited += 1
+            continue
         api_calls_total += 1
         quota_error_hit = False
         response_text = None
+        error_message = None
         try:
             if provider == "google":
-                response = client.generate_content(prompt)
+                response = call_with_deadline(model_info, lambda timeout, prompt=prompt: client.generate_content(prompt, request_options={"timeout": timeout}))
                 response_text = response.text
             elif provider == "openai":
-                completion = client.chat.completions.create(
+                completion = call_with_deadline(model_info, lambda timeout, prompt=prompt: client.chat.completions.create(
                     model=model_name,
-                    messages=[{"role": "user", "content": prompt}]
-                )
+                    messages=[{"role": "user", "content": prompt}],
+                    timeout=timeout
+                ))
                 response_text = completion.choices[0].message.content
             else:
                 results[prompt] = f"ERROR: Unknown provider '{provider}' for model {model_name}"
@@ -430,16 +716,31 @@ def run_lipogram_benchmark(model_info, client, prompts_list):
             results[prompt] = error_message
             api_calls_failed_other += 1
 
-        if SECONDS_BETWEEN_API_CALLS > 0 and not quota_error_hit:
+        circuit_tripped = False
+        if error_message and not quota_error_hit:
+            circuit_tripped = record_circuit_failure(model_info, error_message)
+        elif response_text:
+            record_circuit_success(model_info)
+
+        if SECONDS_BETWEEN_API_CALLS > 0 and not quota_error_hit and not circuit_tripped:
             time.sleep(SECONDS_BETWEEN_API_CALLS)
 
         if quota_error_hit:
             print(f"INFO: API Quota Exceeded in {benchmark_name} for {model_name}. Skipping remaining prompts for this model in this benchmark.")
-            for remaining_prompt_idx in range(i + 1, len(prompts)):
-                results[prompts[remaining_prompt_idx]] = "SKIPPED_DUE_TO_QUOTA"
+            for remaining_prompt_idx in range(i + 1, len(prompts_list)):
+                results[prompts_list[remaining_prompt_idx]] = "SKIPPED_DUE_TO_QUOTA"
             break
     return results
 
+def download_image(url, file_path):
+    """Saves the image at `url` to `file_path`. Returns None on success, or an error message."""
+    try:
+        with urllib.request.urlopen(url, timeout=API_CALL_TIMEOUT_SECONDS) as response, open(file_path, 'wb') as f:
+            f.write(response.read())
+        return None
+    except Exception as e:
+        return f"{type(e).__name__} - {str(e)}"
+
 def run_relogio_benchmark(model_info, client, clock_prompts_list): # Argument changed
     benchmark_name = "CLOCK"
     model_name = model_info['name']
@@ -461,7 +762,7 @@ def run_relogio_benchmark(model_info, client, clock_prompts_list): # Argument ch
     if not (is_image_generation_model or can_generate_images_flag):
         print(f"INFO: {model_name} (type: {model_type}, can_generate_images: {can_generate_images_flag}) "
               f"is not configured for image generation. Skipping {benchmark_name}.")
-        for prompt in prompts:
+        for prompt in clock_prompts_list:
             results[prompt] = {
                 "status": f"EXCLUDED - Model not configured for image generation",
                 "notes": f"Type: {model_type}, Can Generate Images Flag: {can_generate_images_flag}",
@@ -479,12 +780,17 @@ def run_relogio_benchmark(model_info, client, clock_prompts_list): # Argument ch
     # in favor of relying on `model_info`'s `can_generate_images` flag.
     # If 'gemini-1.5-flash-latest' is type 'vision' and 'can_generate_images' is false/unset, it will be excluded by the check above.
 
-    for i, prompt_text in enumerate(prompts):
-        print(f"  Processing {benchmark_name} prompt {i+1}/{len(prompts)} for {model_name}: {prompt_text[:70]}...")
-        global api_calls_total, api_calls_successful, api_calls_failed_quota, api_calls_failed_other
+    for i, prompt_text in enumerate(clock_prompts_list):
+        print(f"  Processing {benchmark_name} prompt {i+1}/{len(clock_prompts_list)} for {model_name}: {prompt_text[:70]}...")
+        global api_calls_total, api_calls_successful, api_calls_failed_quota, api_calls_failed_other, api_calls_short_circuited
+        if not circuit_allows_call(model_info):
+            results[prompt_text] = {"status": short_circuit_message(model_info), "notes": "", "image_path": ""}
+            api_calls_short_circuited += 1
+            continue
         api_calls_total += 1
         quota_error_hit = False
         image_path_or_url = None
+        error_message = None
         status_message = "Error"
         error_notes = ""
 
@@ -494,15 +800,15 @@ def run_relogio_benchmark(model_info, client, clock_prompts_list): # Argument ch
                 image_params = model_info.get("image_params", {})
                 image_size = image_params.get("size", DEFAULT_IMAGE_GENERATION_SIZE)
 
-                response = client.images.generate(
+                response = call_with_deadline(model_info, lambda timeout, prompt_text=prompt_text, image_size=image_size: client.images.generate(
                     model=model_name, # e.g., "dall-e-3"
                     prompt=prompt_text,
                     n=1,
-                    size=image_size
-                )
+                    size=image_size,
+                    timeout=timeout
+                ), timeout=IMAGE_GENERATION_TIMEOUT_SECONDS, allow_hedge=False)
                 image_url = response.data[0].url
-                # Optional: Download the image and save locally
-                # For now, just storing the URL
+                # The image is downloaded to CLOCK_IMAGES_DIR below so it can be analyzed locally
                 image_path_or_url = image_url
                 status_message = "Generated via OpenAI"
                 api_calls_successful += 1
@@ -532,12 +838,18 @@ def run_relogio_benchmark(model_info, client, clock_prompts_list): # Argument ch
                 clean_prompt = "".join(c if c.isalnum() else "_" for c in prompt_text[:50])
                 timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
                 image_filename = f"{i+1:03d}_{clean_prompt}_{model_name.replace('-','_')}_{timestamp}.png" # .png may not be accurate if URL
-                saved_image_path = os.path.join(CLOCK_IMAGES_DIR, image_filename) # This is a conceptual path if URL
+                saved_image_path = os.path.join(CLOCK_IMAGES_DIR, image_filename)
+                notes = f"Image URL: {image_path_or_url}" if image_path_or_url.startswith("http") else "Image saved conceptually"
+                if image_path_or_url.startswith("http"):
+                    download_error = download_image(image_path_or_url, saved_image_path)
+                    if download_error:
+                        notes += f" (download failed: {download_error})"
+                        saved_image_path = ""
 
                 results[prompt_text] = {
                     "status": status_message,
-                    "notes": f"Image URL: {image_path_or_url}" if image_path_or_url.startswith("http") else "Image saved conceptually",
-                    "image_path": saved_image_path # Store our conceptual local path or the URL itself
+                    "notes": notes,
+                    "image_path": saved_image_path
                 }
             else: # No image generated due to error or pending implementation
                  results[prompt_text] = {
@@ -563,13 +875,19 @@ def run_relogio_benchmark(model_info, client, clock_prompts_list): # Argument ch
             api_calls_failed_other +=1
 
 
-        if SECONDS_BETWEEN_API_CALLS > 0 and not quota_error_hit:
+        circuit_tripped = False
+        if error_message and not quota_error_hit:
+            circuit_tripped = record_circuit_failure(model_info, error_message)
+        elif image_path_or_url:
+            record_circuit_success(model_info)
+
+        if SECONDS_BETWEEN_API_CALLS > 0 and not quota_error_hit and not circuit_tripped:
             time.sleep(SECONDS_BETWEEN_API_CALLS)
 
         if quota_error_hit:
             print(f"INFO: API Quota Exceeded in {benchmark_name} for {model_name}. Skipping remaining prompts.")
-            for remaining_prompt_idx in range(i + 1, len(prompts)):
-                results[prompts[remaining_prompt_idx]] = {
+            for remaining_prompt_idx in range(i + 1, len(clock_prompts_list)):
+                results[clock_prompts_list[remaining_prompt_idx]] = {
                     "status": "SKIPPED_DUE_TO_QUOTA", "notes": "", "image_path": ""
                 }
             break
@@ -600,12 +918,25 @@ if __name__ == "__main__":
 
     all_benchmark_results = {} # Store results per model
 
+    preflight_results = {}
+    if RUN_PREFLIGHT_CHECKS:
+        preflight_results = run_preflight_checks(MODELS_TO_BENCHMARK, clients)
+
     for model_info in MODELS_TO_BENCHMARK:
         model_name = model_info["name"]
         provider = model_info["provider"]
         model_type = model_info["type"]
         client_instance = None
 
+        if model_name in preflight_results and not preflight_results[model_name]["ok"]:
+            print(f"\n===== Skipping model: {model_name} (Provider: {provider}) - preflight check failed =====")
+            all_benchmark_results[model_name] = {
+                "error": f"Preflight check failed: {preflight_results[model_name]['detail']}",
+                "enigma_results": {}, "visual_results": {},
+                "lipogram_results": {}, "relogio_results": {}
+            }
+            continue
+
         print(f"\n===== Starting benchmarks for model: {model_name} (Provider: {provider}, Type: {model_type}) =====")
 
         try:
@@ -672,10 +1003,33 @@ if __name__ == "__main__":
 
         all_benchmark_results[model_name] = current_model_results
 
+    # Local CLOCK image analysis (CPU only, no API calls)
+    clock_analysis_results = []
+    if RUN_CLOCK_IMAGE_ANALYSIS:
+        clock_image_paths = [entry["image_path"] for model_results in all_benchmark_results.values()
+                             for entry in model_results.get("relogio_results", {}).values()
+                             if isinstance(entry, dict) and entry.get("image_path") and os.path.exists(entry["image_path"])]
+        if clock_image_paths:
+            print(f"\n--- Analyzing {len(clock_image_paths)} CLOCK image(s) locally ---")
+            # Never let the local analysis (process pool, image decoding) lose the results of the paid API calls
+            try:
+                clock_analysis_results = analyze_clock_images(clock_image_paths, clock_prompts_list)
+                for analysis in clock_analysis_results:
+                    print(f"  {os.path.basename(analysis['image_path'])}: {analysis['status']} "
+                          f"(requested: {analysis['requested_time']}, displayed: {analysis['displayed_time']})")
+            except Exception as e:
+                print(f"ERROR: CLOCK image analysis failed: {type(e).__name__} - {str(e)}")
+                clock_analysis_results = {"error": f"CLOCK image analysis failed: {type(e).__name__} - {str(e)}"}
+
+    drain_unfinished_attempts()
+
     # Consolidate all results into the final structure
     final_output_results = {
         "benchmark_run_date": datetime.now().isoformat(),
         "models_tested": list(all_benchmark_results.keys()),
+        "preflight_results": preflight_results,
+        "hedged_requests": copy.deepcopy(hedge_audit_log), # Attempts that outlived the drain may still be writing to the live dicts
+        "clock_analysis": clock_analysis_results,
         "results_by_model": all_benchmark_results
         # Individual benchmark types are now nested under each model
     }
@@ -691,24 +1045,13 @@ if __name__ == "__main__":
         print("Intermediate results (if any):")
         print(json.dumps(final_output_results, indent=4, ensure_ascii=False))
 
-    print("\n--- API Call Summary ---")
-        "relogio_results": relogio_results
-    }
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    results_filename = os.path.join(RESULTS_DIR, f"benchmark_results_{timestamp}.json")
-    try:
-        with open(results_filename, 'w', encoding='utf-8') as f:
-            json.dump(all_results, f, indent=4, ensure_ascii=False)
-        print(f"\n✅ Benchmark run complete. Results saved to:\n{results_filename}")
-    except Exception as e:
-        print(f"ERROR: Could not save results to JSON file: {e}")
-        print("Intermediate results (if any):")
-        print(json.dumps(all_results, indent=4, ensure_ascii=False))
-
     print("\n--- API Call Summary ---")
     print(f"Total API Calls Attempted: {api_calls_total}")
     print(f"Successful API Calls: {api_calls_successful}")
     print(f"Failed API Calls (Quota): {api_calls_failed_quota}")
     print(f"Failed API Calls (Other): {api_calls_failed_other}")
     print(f"API Calls Pending Implementation: {api_calls_pending_implementation}")
+    print(f"Prompts Short-Circuited (Circuit Breaker): {api_calls_short_circuited}")
+    print(f"Hedged Requests Sent: {api_calls_hedged}")
+    print(f"API Calls Timed Out: {api_calls_timed_out}")
     print("-------------------------")
@@ -0,0 +1,180 @@
+# automation/run_triage.py
+#
+# Adaptive early-stopping evaluation for fast model triage.
+# Instead of running every prompt for every model, prompts are interleaved across LIPOGRAM tiers and ENIGMA, each
+# response is scored automatically, and a confidence interval of each model's score is updated as results come in.
+# A model stops receiving prompts once its interval is narrow enough or clearly above/below TRIAGE_THRESHOLD, or as
+# soon as it hits a quota error.
+# Scoring, the stopping rule and their limits are in triage_scoring.py. Full results must still be scored by hand.
+#
+# Usage (from the automation directory):
+#     python run_triage.py
+
+import os
+import re
+import json
+from datetime import datetime
+import google.generativeai as genai
+import openai
+import run_benchmark
+from run_benchmark import (
+    GEMINI_API_KEY, OPENAI_API_KEY, MODELS_TO_BENCHMARK, RESULTS_DIR,
+    ENIGMA_PROMPTS_PATH, LIPOGRAM_PROMPTS_PATH, RUN_PREFLIGHT_CHECKS,
+    parse_md_file, run_preflight_checks, run_enigma_benchmark, run_lipogram_benchmark, drain_unfinished_attempts
+)
+from triage_scoring import (
+    TRIAGE_THRESHOLD, TRIAGE_CONFIDENCE, TRIAGE_MAX_INTERVAL_WIDTH, TRIAGE_MIN_SCORED_PROMPTS,
+    score_lipogram_response, score_enigma_response, max_triage_looks, score_interval, stop_reason
+)
+
+# Results that are not model answers (see the benchmark functions in run_benchmark.py)
+NON_ANSWER_PREFIXES = ("API Error", "Non-API Error", "ERROR", "SKIPPED_", "EXCLUDED", "PENDING_IMPLEMENTATION")
+
+# --- PARSING ---
+def parse_lipogram_tiers(file_path):
+    """Returns LIPOGRAM prompts grouped by tier: {tier_number: [prompt, ...]}."""
+    if not os.path.exists(file_path):
+        return {}
+    tiers = {}
+    current_tier = 0
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            stripped = line.strip()
+            tier_match = re.match(r'#+\s*Tier\s+(\d+)', stripped, re.IGNORECASE)
+            if tier_match:
+                current_tier = int(tier_match.group(1))
+            elif stripped and stripped[0].isdigit():
+                tiers.setdefault(current_tier, []).append(stripped)
+    return tiers
+
+def build_triage_queue(lipogram_tiers, enigma_prompts):
+    """Interleaves prompts round-robin across the LIPOGRAM tiers and ENIGMA, so early results cover every tier."""
+    streams = [[("LIPOGRAM", tier, prompt) for prompt in lipogram_tiers[tier]] for tier in sorted(lipogram_tiers)]
+    streams.append([("ENIGMA", None, prompt) for prompt in enigma_prompts])
+    queue = []
+    for round_index in range(max((len(stream) for stream in streams), default=0)):
+        queue.extend(stream[round_index] for stream in streams if round_index < len(stream))
+    return queue
+
+# --- TRIAGE EXECUTION ---
+def run_triage_prompt(model_info, client, benchmark_name, prompt):
+    """Runs a single prompt through the regular benchmark function. Returns (response_text or None, score or None)."""
+    if benchmark_name == "LIPOGRAM":
+        response_text = run_lipogram_benchmark(model_info, client, [prompt]).get(prompt)
+        scorer = score_lipogram_response
+    else:
+        response_text = run_enigma_benchmark(model_info, client, [prompt]).get(prompt)
+        scorer = score_enigma_response
+    if not isinstance(response_text, str) or response_text.startswith(NON_ANSWER_PREFIXES):
+        return response_text, None
+    return response_text, scorer(prompt, response_text)
+
+def run_triage(models, clients, queue):
+    """Sends the queue to all models round-robin, dropping each model once stop_reason() is reached."""
+    state = {}
+    for model_info in models:
+        state[model_info['name']] = {"model_info": model_info, "client": clients[model_info['name']], "scores": [],
+                                     "items": [], "calls": 0, "position": 0, "stop_reason": None}
+    active = [name for name in state]
+    max_looks = max_triage_looks(len(queue))
+    while active:
+        for model_name in list(active):
+            model_state = state[model_name]
+            if model_state["position"] >= len(queue):
+                model_state["stop_reason"] = "EXHAUSTED"
+                active.remove(model_name)
+                continue
+            benchmark_name, tier, prompt = queue[model_state["position"]]
+            model_state["position"] += 1
+            calls_before = run_benchmark.api_calls_total
+            quota_errors_before = run_benchmark.api_calls_failed_quota
+            response_text, score = run_triage_prompt(model_state["model_info"], model_state["client"], benchmark_name, prompt)
+            model_state["calls"] += run_benchmark.api_calls_total - calls_before
+            model_state["items"].append({"benchmark": benchmark_name, "tier": tier, "prompt": prompt,
+                                         "response": response_text, "score": score})
+            # One-prompt benchmark runs do not back off after a 429, so a rate-limited model is dropped right away
+            if run_benchmark.api_calls_failed_quota > quota_errors_before or response_text == "SKIPPED_DUE_TO_QUOTA":
+                print(f"  TRIAGE {model_name}: quota exceeded -> STOP (QUOTA)")
+                model_state["stop_reason"] = "QUOTA"
+                active.remove(model_name)
+                continue
+            if score is not None:
+                model_state["scores"].append(score)
+            reason = stop_reason(model_state["scores"], max_looks)
+            low, high = score_interval(model_state["scores"], max_looks)
+            print(f"  TRIAGE {model_name}: {len(model_state['scores'])} scored, interval [{low:.2f}, {high:.2f}]"
+                  + (f" -> STOP ({reason})" if reason else ""))
+            if reason:
+                model_state["stop_reason"] = reason
+                active.remove(model_name)
+
+    ranking = []
+    for model_name, model_state in state.items():
+        scores = model_state["scores"]
+        low, high = score_interval(scores, max_looks)
+        ranking.append({
+            "model": model_name,
+            "score": round(sum(scores) / len(scores), 3) if scores else None,
+            "interval": [round(low, 3), round(high, 3)],
+            "scored_prompts": len(scores),
+            "api_calls": model_state["calls"],
+            "stop_reason": model_state["stop_reason"],
+            "items": model_state["items"]
+        })
+    ranking.sort(key=lambda entry: (entry["score"] is not None, entry["score"] or 0, entry["interval"][0]), reverse=True)
+    return ranking
+
+if __name__ == "__main__":
+    print("Initializing Model Triage (adaptive early stopping)...")
+    enigma_prompts_list = parse_md_file(ENIGMA_PROMPTS_PATH)
+    lipogram_tiers = parse_lipogram_tiers(LIPOGRAM_PROMPTS_PATH)
+    triage_queue = build_triage_queue(lipogram_tiers, enigma_prompts_list)
+
+    shared_clients = {}
+    if OPENAI_API_KEY and OPENAI_API_KEY != "YOUR_OPENAI_API_KEY_HERE":
+        shared_clients["openai"] = openai.OpenAI(api_key=OPENAI_API_KEY)
+
+    # Only text-capable models take part in ENIGMA and LIPOGRAM
+    triage_models = [m for m in MODELS_TO_BENCHMARK if m["type"] in ["text", "vision"]]
+    if RUN_PREFLIGHT_CHECKS:
+        preflight_results = run_preflight_checks(triage_models, shared_clients)
+        triage_models = [m for m in triage_models if preflight_results[m["name"]]["ok"]]
+
+    model_clients = {}
+    for model_info in list(triage_models):
+        if model_info["provider"] == "google" and GEMINI_API_KEY and GEMINI_API_KEY != "YOUR_GEMINI_API_KEY_HERE":
+            model_clients[model_info["name"]] = genai.GenerativeModel(model_info["name"])
+        elif model_info["provider"] == "openai" and shared_clients.get("openai"):
+            model_clients[model_info["name"]] = shared_clients["openai"]
+        else:
+            print(f"WARNING: No client for {model_info['name']} ({model_info['provider']}). Skipping.")
+            triage_models.remove(model_info)
+
+    ranking = run_triage(triage_models, model_clients, triage_queue)
+    drain_unfinished_attempts()
+    full_run_calls = len(triage_models) * len(triage_queue)
+
+    print("\n--- Triage Ranking ---")
+    for position, entry in enumerate(ranking, start=1):
+        score = f"{entry['score']:.2f}" if entry["score"] is not None else "n/a"
+        print(f"{position}. {entry['model']}: {score} [{entry['interval'][0]:.2f}, {entry['interval'][1]:.2f}] "
+              f"after {entry['api_calls']} call(s) - {entry['stop_reason']}")
+    print(f"API calls used: {run_benchmark.api_calls_total} (a full ENIGMA + LIPOGRAM run would make {full_run_calls})")
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    results_filename = os.path.join(RESULTS_DIR, f"triage_results_{timestamp}.json")
+    triage_output = {
+        "triage_run_date": datetime.now().isoformat(),
+        "settings": {"threshold": TRIAGE_THRESHOLD, "confidence": TRIAGE_CONFIDENCE,
+                     "max_interval_width": TRIAGE_MAX_INTERVAL_WIDTH, "min_scored_prompts": TRIAGE_MIN_SCORED_PROMPTS},
+        "api_calls_total": run_benchmark.api_calls_total,
+        "full_run_api_calls": full_run_calls,
+        "ranking": ranking
+    }
+    try:
+        with open(results_filename, 'w', encoding='utf-8') as f:
+            json.dump(triage_output, f, indent=4, ensure_ascii=False)
+        print(f"\n✅ Triage complete. Results saved to:\n{results_filename}")
+    except Exception as e:
+        print(f"ERROR: Could not save results to JSON file: {e}")
+        print(json.dumps(triage_output, indent=4, ensure_ascii=False))
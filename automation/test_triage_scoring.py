@@ -0,0 +1,87 @@
+# automation/test_triage_scoring.py
+#
+# Run from the automation directory: python -m pytest -q test_triage_scoring.py
+
+import pytest
+from triage_scoring import (
+    TRIAGE_MAX_INTERVAL_WIDTH, score_enigma_response, score_lipogram_response, max_triage_looks, score_interval,
+    stop_reason
+)
+
+ENIGMA_ANSWERS = [
+    # (prompt number, response, expected score)
+    (1, "Four people went fishing.", 1.0),
+    (1, "There were four of them: two fathers and two sons who are not related.", 1.0),
+    (1, "The answer is 4 people.", 1.0),
+    (1, "With four fish caught and each eating one, the answer is three people: a grandfather, his son and grandson.", 0.0),
+    (1, "The answer is three: a grandfather, a father and a son.", 0.0),
+    (1, "Three people - the grandfather is also a father.", 0.0),
+    (2, "The surgeon is the boy's father. The stepfather is married to the boy's mother.", 1.0),
+    (2, "It is possible because the surgeon is his biological father; his parents divorced.", 1.0),
+    (2, "The surgeon is the boy's mother.", 0.0),
+    (2, "This is a classic riddle: the answer is the mother, who is the surgeon. She is his mother.", 0.0),
+    (3, "He takes the stairs for the exercise.", 1.0),
+    (3, "He visits a friend on the 11th floor before going home.", 1.0),
+    (3, "He isn't short - the button for the 10th floor is broken.", 1.0),
+    (3, "He is too short to reach the 10th floor button, so he rides to the 11th and walks down.", 0.0),
+    (3, "He is a dwarf and can only reach the 11th floor button, then walks one flight down.", 0.0),
+    (4, "The man owed the bartender money, so the bartender threatened him.", 1.0),
+    (4, "The bartender mistook him for someone else he had a feud with.", 1.0),
+    (4, "The man had hiccups, and the bartender scared them away with the gun.", 0.0),
+    (4, "He had the hiccups; the fright cured them, so he left.", 0.0),
+    (5, "He was tall enough to tie the rope to the 2 meter beam and then dropped.", 1.0),
+    (5, "He jumped up, grabbed the beam and tied the rope.", 1.0),
+    (5, "He stood on a block of ice which melted, leaving the puddle.", 0.0),
+    (5, "He climbed onto a giant block of ice that has since melted.", 0.0),
+]
+
+@pytest.mark.parametrize("number, response, expected", ENIGMA_ANSWERS)
+def test_enigma_answer_key(number, response, expected):
+    assert score_enigma_response(f"{number}. Riddle text", response) == expected
+
+def test_enigma_prompt_without_rule_is_unscored():
+    assert score_enigma_response("99. A new riddle", "Some answer") is None
+
+def test_lipogram_constraint_adherence():
+    prompt = "1.  \"Write a story. You must not use the letter 'X'.\""
+    text = " ".join(["word"] * 60)
+    assert score_lipogram_response(prompt, text) == 1.0
+    assert score_lipogram_response(prompt, text + " box") == 0.6
+    assert score_lipogram_response(prompt, text + " box fox") == 0.2
+    assert score_lipogram_response(prompt, text + " box fox six wax") == 0.0
+    assert score_lipogram_response(prompt, "Too short.") == 0.0
+
+def test_clear_results_stop_before_the_queue_runs_out():
+    max_looks = max_triage_looks(15)
+    assert stop_reason([1.0] * 8, max_looks) == "ABOVE_THRESHOLD"
+    assert stop_reason([0.0] * 8, max_looks) == "BELOW_THRESHOLD"
+    assert stop_reason([1.0] * 4, max_looks) is None
+
+def first_stop(scores, queue_length=15):
+    """Feeds scores one at a time, as run_triage does. Returns (number of scores, reason) of the first stop."""
+    max_looks = max_triage_looks(queue_length)
+    for n in range(1, len(scores) + 1):
+        reason = stop_reason(scores[:n], max_looks)
+        if reason:
+            return n, reason
+    return None
+
+@pytest.mark.parametrize("scores, expected", [
+    ([1.0] * 15, (7, "ABOVE_THRESHOLD")),
+    ([0.0] * 15, (7, "BELOW_THRESHOLD")),
+    ([1.0, 0.0] * 7 + [1.0], (13, "CONVERGED")),
+])
+def test_first_stop_when_scores_arrive_one_at_a_time(scores, expected):
+    assert first_stop(scores) == expected
+
+def test_interval_width_is_reachable_for_a_mixed_record():
+    max_looks = max_triage_looks(15)
+    low, high = score_interval([1.0, 0.0] * 7, max_looks)
+    assert high - low <= TRIAGE_MAX_INTERVAL_WIDTH
+    assert stop_reason([1.0, 0.0] * 7, max_looks) == "CONVERGED"
+    assert stop_reason([1.0, 0.0] * 3, max_looks) is None
+
+def test_repeated_looks_widen_the_interval():
+    low_single, high_single = score_interval([1.0, 0.0] * 5, max_looks=1)
+    low_corrected, high_corrected = score_interval([1.0, 0.0] * 5, max_looks=12)
+    assert low_corrected < low_single and high_corrected > high_single
@@ -0,0 +1,121 @@
+# automation/triage_scoring.py
+#
+# Automatic scoring and stopping rules used by run_triage.py. Kept free of API client imports so it can be tested
+# on its own (see test_triage_scoring.py).
+#
+# The scores are heuristics meant for screening only:
+#   - LIPOGRAM: the "Constraint Adherence" criterion of LIPOGRAM/scoring.md (forbidden letter count).
+#   - ENIGMA: keyword answer key (ENIGMA_TRIAGE_RULES) derived from ENIGMA/scoring.md.
+#
+# Stopping rule: after every scored prompt, a Wilson interval of the model's mean score is checked against
+# TRIAGE_THRESHOLD and TRIAGE_MAX_INTERVAL_WIDTH. Because the interval is checked repeatedly, the error budget
+# (1 - TRIAGE_CONFIDENCE) is split evenly over every look at which the model could stop (Bonferroni alpha
+# spending), so the whole sequence of checks holds at TRIAGE_CONFIDENCE. The width rule only applies to intervals
+# that are not clipped at 0 or 1: a model that keeps passing (or failing) is narrow only because of the clipping,
+# and should run until it is clearly above (below) the threshold instead.
+# Limits: with the 15 ENIGMA + LIPOGRAM prompts there are at most 12 looks (per-look confidence ~99.2%). A model
+# that passes (or fails) everything is clearly above (below) the threshold after 7 prompts, but an even pass/fail
+# record only converges after 13 and never gets narrower than about 0.56 - so TRIAGE_MAX_INTERVAL_WIDTH cannot be set
+# much lower than 0.6 without adding prompts, and triage only separates models coarsely. The Wilson interval uses the
+# Bernoulli variance, which is an upper bound for the fractional LIPOGRAM scores.
+
+import re
+import math
+from statistics import NormalDist
+
+# --- TRIAGE SETTINGS ---
+TRIAGE_THRESHOLD = 0.5 # Score (0-1) a model must clearly beat
+TRIAGE_CONFIDENCE = 0.9 # Confidence level of the whole sequence of checks, not of a single look
+TRIAGE_MAX_INTERVAL_WIDTH = 0.6 # Stop once the interval is this narrow (see the limits above)
+TRIAGE_MIN_SCORED_PROMPTS = 4 # Never stop before this many prompts have been scored
+LIPOGRAM_MIN_WORDS = 50 # Shorter LIPOGRAM responses count as a refusal (target length is ~150 words)
+
+# Negated mentions ("not three", "isn't short") are not counted as the pitfall answer
+_NOT = r"(?<!not )(?<!n't )(?<!no )"
+
+# ENIGMA answer key, by prompt number. Patterns are anchored to the answer itself rather than to words the model
+# may repeat from the prompt (e.g. "four fish"). A response scores 1 if a "correct" pattern appears before any
+# "pitfall" pattern.
+ENIGMA_TRIAGE_RULES = {
+    1: {"correct": r"\b(four|4) (different |distinct |separate )?(people|persons|men|individuals|fishermen|of them)\b"
+                   r"|\b(answer is|there (are|were)) (four|4)\b",
+        "pitfall": _NOT + r"\b(three|3)\b(?! (fish|fathers|sons))"},
+    2: {"correct": r"\b(surgeon|he) (is|was) (indeed |really |actually |simply |literally )?(the boy's|his|the) "
+                   r"(biological |real |birth )?father\b|\bbiological father\b",
+        "pitfall": r"\b(surgeon|she|answer) (is|was|could be|must be) (the boy's|his|the|a) (mother|mom)\b"},
+    3: {"correct": r"\b(for (the |some )?exercise|to (get some )?exercise|fitness|visit(s|ing)? (a |his )?(friend|colleague|neighbou?r)"
+                   r"|(friend|colleague|neighbou?r) (lives )?on the 11th|view|broken|out of order|malfunction|delay"
+                   r"|(enjoys|likes) (the |a )?(walk|stairs))\b",
+        "pitfall": _NOT + r"\b(short|shorter|dwarf|little person|small stature|child|can(no|')t reach|unable to reach|only reach)\b"},
+    4: {"correct": r"\b(owe[sd]?|debt|money|conflict|grudge|rob(bed|bery|ber)?|mistook|mistaken|someone else|affair"
+                   r"|troublemaker|trouble|fight|banned|altercation|revenge|feud)\b",
+        "pitfall": r"\bhiccups?\b"},
+    5: {"correct": r"\b(tall|jump(ed|ing)?|climb(ed|ing)? (up )?(the |a |onto )?(wall|beam|rope|post|door)|pull(ed|ing)? himself up)\b",
+        "pitfall": r"\bice\b"},
+}
+
+# --- SCORING ---
+def score_lipogram_response(prompt, response_text):
+    """Constraint Adherence points of LIPOGRAM/scoring.md, normalized to 0-1. Returns None if the prompt has no letter."""
+    letter_match = re.search(r"letter '(\w)'", prompt)
+    if not letter_match:
+        return None
+    if len(response_text.split()) < LIPOGRAM_MIN_WORDS:
+        return 0.0
+    occurrences = response_text.lower().count(letter_match.group(1).lower())
+    if occurrences == 0:
+        points = 5
+    elif occurrences == 1:
+        points = 3
+    elif occurrences <= 3:
+        points = 1
+    else:
+        points = 0
+    return points / 5
+
+def score_enigma_response(prompt, response_text):
+    """1.0 / 0.0 from ENIGMA_TRIAGE_RULES, or None if there is no rule for this prompt."""
+    number_match = re.match(r'\s*(\d+)\.', prompt)
+    rule = ENIGMA_TRIAGE_RULES.get(int(number_match.group(1))) if number_match else None
+    if not rule:
+        return None
+    text = response_text.lower().replace("’", "'")
+    correct = re.search(rule["correct"], text)
+    pitfall = re.search(rule["pitfall"], text)
+    if correct and (not pitfall or correct.start() < pitfall.start()):
+        return 1.0
+    return 0.0
+
+# --- SEQUENTIAL STOPPING ---
+def max_triage_looks(queue_length):
+    """Number of looks at which a model could stop: one per scored prompt from TRIAGE_MIN_SCORED_PROMPTS on."""
+    return max(queue_length - TRIAGE_MIN_SCORED_PROMPTS + 1, 1)
+
+def score_interval(scores, max_looks=1, confidence=TRIAGE_CONFIDENCE):
+    """Wilson interval of the mean of scores in [0, 1], at the per-look level 1 - (1 - confidence) / max_looks.
+
+    Returns (low, high).
+    """
+    n = len(scores)
+    if n == 0:
+        return (0.0, 1.0)
+    look_confidence = 1 - (1 - confidence) / max(max_looks, 1)
+    z = NormalDist().inv_cdf(0.5 + look_confidence / 2)
+    mean = sum(scores) / n
+    denominator = 1 + z * z / n
+    center = (mean + z * z / (2 * n)) / denominator
+    half_width = z * math.sqrt(mean * (1 - mean) / n + z * z / (4 * n * n)) / denominator
+    return (max(0.0, center - half_width), min(1.0, center + half_width))
+
+def stop_reason(scores, max_looks):
+    """Returns why a model can stop receiving prompts, or None if it should continue."""
+    if len(scores) < TRIAGE_MIN_SCORED_PROMPTS:
+        return None
+    low, high = score_interval(scores, max_looks)
+    if high < TRIAGE_THRESHOLD:
+        return "BELOW_THRESHOLD"
+    if low > TRIAGE_THRESHOLD:
+        return "ABOVE_THRESHOLD"
+    if 0.0 < low and high < 1.0 and high - low <= TRIAGE_MAX_INTERVAL_WIDTH:
+        return "CONVERGED"
+    return None